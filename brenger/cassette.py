@@ -0,0 +1,181 @@
+import gzip
+import io
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# Bodies are stored decoded, so only the content type is worth keeping.
+RECORDED_HEADERS = ("Content-Type",)
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    # Each recorded line is flushed, so a gzip cassette whose recorder was never
+    # closed is only missing its end-of-stream marker; keep what was written.
+    with _open(path, "r") as cassette:
+        try:
+            yield from cassette
+        except EOFError:
+            logger.warning("Cassette %s is truncated, it was not closed", path)
+
+
+def _body_text(body) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        return body.decode("utf-8")
+    return body
+
+
+def _interaction_key(method: str, url: str, body: Optional[str]) -> Tuple:
+    return (method.upper(), url, body)
+
+
+class CassetteRecorder(HTTPAdapter):
+    """
+    Transport adapter that performs real requests and writes each
+    request/response pair, with its response time, to a cassette file.
+
+    The cassette is newline-delimited JSON (gzip-compressed when the path ends
+    with ``.gz``), one interaction per line. An existing cassette is
+    overwritten unless ``append`` is set. Auth headers are never written.
+    Call ``close()``, or use the recorder as a context manager, when done.
+    """
+
+    def __init__(self, path: str, append: bool = False, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.path = path
+        self._file = _open(path, "a" if append else "w")
+        self._lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        # Response.elapsed is only set by the session after the adapter
+        # returns, so the timing is measured here, including the body read.
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        content = response.content
+        elapsed = time.perf_counter() - start
+        interaction = {
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "body": _body_text(request.body),
+            },
+            "response": {
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: response.headers[name]
+                    for name in RECORDED_HEADERS
+                    if name in response.headers
+                },
+                "body": content.decode("utf-8", errors="replace"),
+                "elapsed": elapsed,
+            },
+        }
+        with self._lock:
+            self._file.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+            self._file.flush()
+        return response
+
+    def close(self) -> None:
+        super().close()
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class CassettePlayer(BaseAdapter):
+    """
+    Transport adapter that serves responses from a recorded cassette without
+    touching the network.
+
+    Requests are matched on method, URL and body. Repeated matches cycle
+    through the recorded responses in order. With ``replay_latency`` the
+    recorded response time is slept before returning, scaled by
+    ``latency_factor``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        replay_latency: bool = False,
+        latency_factor: float = 1.0,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.replay_latency = replay_latency
+        self.latency_factor = latency_factor
+        self._interactions: Dict[Tuple, Deque[dict]] = {}
+        self._lock = threading.Lock()
+        for line in _read_lines(path):
+            if not line.strip():
+                continue
+            interaction = json.loads(line)
+            recorded = interaction["request"]
+            key = _interaction_key(
+                recorded["method"], recorded["url"], recorded["body"]
+            )
+            self._interactions.setdefault(key, deque()).append(
+                interaction["response"]
+            )
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        key = _interaction_key(request.method, request.url, _body_text(request.body))
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                logger.error(
+                    "No recorded response for %s %s", request.method, request.url
+                )
+                raise ConnectionError(
+                    f"No recorded response for {request.method} {request.url}",
+                    request=request,
+                )
+            recorded_response = recorded.popleft()
+            recorded.append(recorded_response)
+
+        # Session.send overwrites Response.elapsed after the adapter returns,
+        # so recorded latency can only be reproduced by sleeping here.
+        if self.replay_latency:
+            time.sleep(recorded_response["elapsed"] * self.latency_factor)
+        return self._build_response(request, recorded_response)
+
+    def close(self) -> None:
+        pass
+
+    @staticmethod
+    def _build_response(request: PreparedRequest, recorded: dict) -> Response:
+        response = Response()
+        response.status_code = recorded["status_code"]
+        response.reason = recorded["reason"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        body = recorded["body"].encode("utf-8")
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        return response
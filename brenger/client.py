@@ -58,7 +58,8 @@ class BrengerAPIClient:
         if 500 <= response.status_code < 600:
             logger.error("Server Error: status code %s", response.status_code)
             raise APIServerError(
-                f"Brenger API server error (status code: {response.status_code})"
+                f"Brenger API server error (status code: {response.status_code})",
+                status_code=response.status_code,
             )
         if response.status_code >= 400:
             error_description, error_hint, error_validation = _extract_error_details(
@@ -71,7 +72,9 @@ class BrengerAPIClient:
                 f" validation errors: {error_validation}"
             )
             logger.error("Client Error: %s", error_message)
-            raise APIClientError(f"Client Error: {error_message}")
+            raise APIClientError(
+                f"Client Error: {error_message}", status_code=response.status_code
+            )
 
 
 V2_BASE_URL = "https://external-api.brenger.nl/v2/partners"
@@ -145,7 +148,8 @@ class BrengerV2APIClient:
         if 500 <= response.status_code < 600:
             logger.error("Server Error: status code %s", response.status_code)
             raise APIServerError(
-                f"Brenger API server error (status code: {response.status_code})"
+                f"Brenger API server error (status code: {response.status_code})",
+                status_code=response.status_code,
             )
         if response.status_code >= 400:
             error_description, error_hint, error_validation = _extract_error_details(
@@ -158,4 +162,6 @@ class BrengerV2APIClient:
                 f" validation errors: {error_validation}"
             )
             logger.error("Client Error: %s", error_message)
-            raise APIClientError(f"Client Error: {error_message}")
+            raise APIClientError(
+                f"Client Error: {error_message}", status_code=response.status_code
+            )
@@ -1,6 +1,10 @@
 class BrengerAPIException(Exception):
     """Base exception for all Brenger API related errors."""
 
+    def __init__(self, message: str, status_code: int = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
 
 class APIClientError(BrengerAPIException):
     """Exception raised when there's an error on the client side (e.g., bad request)."""
@@ -0,0 +1,253 @@
+import json
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Callable, Iterable, Iterator, Optional
+
+from .client import BrengerAPIClient, BrengerV2APIClient
+from .exceptions import APIClientError
+from .models import Price, ShipmentResponse, V2Price, V2RefundResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_BATCH_SIZE = 1000
+
+SHIPMENT_COLUMNS = (
+    "shipment_id",
+    "state",
+    "shipping_date",
+    "tracking_id",
+    "price_excl_vat_cents",
+    "price_incl_vat_cents",
+    "price_vat_cents",
+    "price_currency",
+    "refund_id",
+    "refund_code",
+    "refund_excl_vat_cents",
+    "refund_incl_vat_cents",
+    "refund_vat_cents",
+    "refund_currency",
+)
+
+INTEGER_COLUMNS = tuple(
+    column for column in SHIPMENT_COLUMNS if column.endswith("_cents")
+)
+
+
+def _to_cents(value: str) -> int:
+    cents = Decimal(value) * 100
+    return int(cents.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def flatten_price(price: Optional[Price]) -> dict:
+    return {
+        "price_excl_vat_cents": price.excl_vat if price else None,
+        "price_incl_vat_cents": price.incl_vat if price else None,
+        "price_vat_cents": price.vat if price else None,
+        "price_currency": price.currency if price else None,
+    }
+
+
+def flatten_v2_price(price: Optional[V2Price], prefix: str) -> dict:
+    return {
+        f"{prefix}_excl_vat_cents": _to_cents(price.excl_vat.value) if price else None,
+        f"{prefix}_incl_vat_cents": _to_cents(price.incl_vat.value) if price else None,
+        f"{prefix}_vat_cents": _to_cents(price.vat.value) if price else None,
+        f"{prefix}_currency": price.incl_vat.currency if price else None,
+    }
+
+
+def flatten_shipment(
+    shipment: ShipmentResponse, refund: Optional[V2RefundResponse] = None
+) -> dict:
+    """
+    Flatten a shipment and its optional refund into one export row.
+
+    All amounts are integer cents: v1 prices already are, v2 refund amounts
+    are decimal strings in the currency's major unit and are converted.
+    """
+    return {
+        "shipment_id": shipment.id,
+        "state": shipment.state,
+        "shipping_date": shipment.shipping_date,
+        "tracking_id": shipment.tracking_id,
+        **flatten_price(shipment.price),
+        "refund_id": refund.refund_id if refund else None,
+        "refund_code": refund.code if refund else None,
+        **flatten_v2_price(refund.amount if refund else None, "refund"),
+    }
+
+
+def _fetch_row(
+    shipment_id: str,
+    client: BrengerAPIClient,
+    v2_client: Optional[BrengerV2APIClient],
+) -> dict:
+    shipment = client.get_shipment(shipment_id)
+    refund = None
+    if v2_client is not None:
+        try:
+            refund = v2_client.get_refund(shipment_id)
+        except APIClientError as exc:
+            if exc.status_code != 404:
+                raise
+            logger.info("No refund found for shipment ID: %s", shipment_id)
+    return flatten_shipment(shipment, refund)
+
+
+def iter_shipment_rows(
+    shipment_ids: Iterable[str],
+    client: BrengerAPIClient,
+    v2_client: Optional[BrengerV2APIClient] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_pending: Optional[int] = None,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+) -> Iterator[dict]:
+    """
+    Fetch shipments (and refunds, when ``v2_client`` is given) concurrently and
+    yield flattened rows in input order.
+
+    At most ``max_pending`` fetches (default ``2 * max_workers``) are in flight
+    or waiting to be consumed, so memory does not grow with the number of IDs.
+
+    By default the first failed fetch is re-raised and stops the export. With
+    ``on_error``, it is called with the shipment ID and the exception instead,
+    and the shipment is skipped. A refund that does not exist (404) is not an
+    error; its columns are left empty.
+    """
+    max_pending = max_pending or 2 * max_workers
+    pending = deque()
+
+    def next_row() -> Optional[dict]:
+        shipment_id, future = pending.popleft()
+        try:
+            return future.result()
+        except Exception as exc:
+            if on_error is None:
+                raise
+            logger.error("Failed to export shipment ID: %s", shipment_id)
+            on_error(shipment_id, exc)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for shipment_id in shipment_ids:
+                future = executor.submit(_fetch_row, shipment_id, client, v2_client)
+                pending.append((shipment_id, future))
+                if len(pending) >= max_pending:
+                    row = next_row()
+                    if row is not None:
+                        yield row
+            while pending:
+                row = next_row()
+                if row is not None:
+                    yield row
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+class NDJSONWriter:
+    """Writes one JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, row: dict) -> None:
+        self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ParquetWriter:
+    """
+    Writes rows to a Parquet file in row groups of ``batch_size``.
+
+    Requires ``pyarrow``.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet export requires the pyarrow package") from exc
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                (column, pa.int64() if column in INTEGER_COLUMNS else pa.string())
+                for column in SHIPMENT_COLUMNS
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self.batch_size = batch_size
+        self._rows = []
+
+    def write(self, row: dict) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+    def _flush(self) -> None:
+        if self._rows:
+            table = self._pa.Table.from_pylist(self._rows, schema=self._schema)
+            self._writer.write_table(table)
+            self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def export_shipments(
+    shipment_ids: Iterable[str],
+    path: str,
+    client: BrengerAPIClient,
+    v2_client: Optional[BrengerV2APIClient] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_pending: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+) -> int:
+    """
+    Stream shipment rows to ``path`` and return the number of rows written.
+
+    Files ending in ``.parquet`` are written as Parquet in row groups of
+    ``batch_size``, anything else as NDJSON. See ``iter_shipment_rows`` for
+    ``max_pending`` and ``on_error``.
+    """
+    if path.endswith(".parquet"):
+        writer = ParquetWriter(path, batch_size=batch_size)
+    else:
+        writer = NDJSONWriter(path)
+
+    count = 0
+    with writer:
+        for row in iter_shipment_rows(
+            shipment_ids,
+            client,
+            v2_client,
+            max_workers=max_workers,
+            max_pending=max_pending,
+            on_error=on_error,
+        ):
+            writer.write(row)
+            count += 1
+    logger.info("Exported %s shipments to %s", count, path)
+    return count
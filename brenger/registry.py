@@ -0,0 +1,252 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+from .client import DEFAULT_TIMEOUT, BrengerV2APIClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 50
+DEFAULT_IDLE_TIMEOUT = 300
+
+
+class TenantMetrics:
+    """Request counters for a single tenant, tagged with its metrics labels."""
+
+    def __init__(self, labels: Dict[str, str]) -> None:
+        self.labels = labels
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, error: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            if error:
+                self.errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "labels": dict(self.labels),
+                "requests": self.requests,
+                "errors": self.errors,
+                "total_latency": self.total_latency,
+            }
+
+
+class _RateLimiter:
+    """Spaces calls so that at most ``rate`` requests start per second."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class TenantBudget:
+    """
+    Per-API-key state kept by the registry: metrics, rate limiter and
+    concurrency cap.
+
+    It outlives the client objects, so an evicted client and its replacement
+    share one budget and the tenant's metrics are never reset.
+    """
+
+    def __init__(
+        self,
+        labels: Dict[str, str],
+        rate_limit: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        self.metrics = TenantMetrics(labels)
+        self._rate_limiter = _RateLimiter(rate_limit) if rate_limit else None
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+
+    def acquire(self) -> None:
+        # Take the concurrency slot first: a rate limit slot reserved while
+        # waiting on the semaphore would be stale by the time the call starts.
+        if self._semaphore:
+            self._semaphore.acquire()
+        if self._rate_limiter:
+            try:
+                self._rate_limiter.acquire()
+            except BaseException:
+                self.release()
+                raise
+
+    def release(self) -> None:
+        if self._semaphore:
+            self._semaphore.release()
+
+
+class TenantV2APIClient(BrengerV2APIClient):
+    """
+    V2 client handed out by ``BrengerClientRegistry``.
+
+    Requests go through the registry's shared connection pool and are subject
+    to this tenant's rate and concurrency budget.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        adapter: HTTPAdapter,
+        budget: TenantBudget,
+        timeout: int = DEFAULT_TIMEOUT,
+        base_url: str = None,
+    ) -> None:
+        super().__init__(api_key, timeout=timeout, base_url=base_url)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.budget = budget
+        self.last_used = time.monotonic()
+
+    @property
+    def metrics(self) -> TenantMetrics:
+        return self.budget.metrics
+
+    def _request(self, method: str, url: str, **kwargs) -> Response:
+        self.last_used = time.monotonic()
+        self.budget.acquire()
+        start = time.monotonic()
+        error = True
+        try:
+            response = super()._request(method, url, **kwargs)
+            error = response.status_code >= 400
+            return response
+        finally:
+            self.budget.release()
+            self.metrics.record(time.monotonic() - start, error)
+            self.last_used = time.monotonic()
+
+
+class BrengerClientRegistry:
+    """
+    Hands out one v2 client per API key, all backed by a single connection pool.
+
+    Each tenant gets its own auth headers, rate/concurrency budget and metrics
+    labels. Clients that have not been used for ``idle_timeout`` seconds are
+    evicted on the next lookup; the tenant's budget and metrics are kept, so a
+    replacement client shares them with any evicted one still in use.
+
+    Budgets are only released by ``evict(api_key, forget=True)``, so callers
+    with an unbounded set of keys should forget the ones they are done with.
+    """
+
+    def __init__(
+        self,
+        rate_limit: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: int = DEFAULT_TIMEOUT,
+        base_url: str = None,
+    ) -> None:
+        self.rate_limit = rate_limit
+        self.max_concurrency = max_concurrency
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.base_url = base_url
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self._clients: Dict[str, TenantV2APIClient] = {}
+        self._budgets: Dict[str, TenantBudget] = {}
+        self._lock = threading.Lock()
+
+    def get_client(
+        self,
+        api_key: str,
+        tenant: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> TenantV2APIClient:
+        """
+        Return the client for ``api_key``, creating it on first use.
+
+        ``tenant`` is used as the metrics label; the label and limits default
+        to the registry-wide values and are fixed the first time a key is seen.
+        """
+        with self._lock:
+            self._evict_idle()
+            client = self._clients.get(api_key)
+            if client is None:
+                budget = self._budgets.get(api_key)
+                if budget is None:
+                    budget = TenantBudget(
+                        {"tenant": tenant or _mask_key(api_key)},
+                        rate_limit=rate_limit or self.rate_limit,
+                        max_concurrency=max_concurrency or self.max_concurrency,
+                    )
+                    self._budgets[api_key] = budget
+                client = TenantV2APIClient(
+                    api_key,
+                    self.adapter,
+                    budget,
+                    timeout=self.timeout,
+                    base_url=self.base_url,
+                )
+                self._clients[api_key] = client
+                logger.info(
+                    "Registered Brenger client for tenant: %s", budget.metrics.labels
+                )
+            client.last_used = time.monotonic()
+            return client
+
+    def evict(self, api_key: str, forget: bool = False) -> None:
+        """
+        Drop the client for ``api_key``. With ``forget`` its budget and metrics
+        are dropped too, and the key starts afresh on the next lookup.
+        """
+        with self._lock:
+            self._clients.pop(api_key, None)
+            if forget:
+                self._budgets.pop(api_key, None)
+
+    def metrics(self) -> list[dict]:
+        """Return a snapshot per tenant, including tenants whose client was evicted."""
+        with self._lock:
+            budgets = list(self._budgets.values())
+        return [budget.metrics.snapshot() for budget in budgets]
+
+    def close(self) -> None:
+        with self._lock:
+            self._clients.clear()
+        self.adapter.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def _evict_idle(self) -> None:
+        # Evicted sessions are dropped rather than closed: closing them would
+        # also close the adapter shared with every other tenant.
+        cutoff = time.monotonic() - self.idle_timeout
+        for api_key, client in list(self._clients.items()):
+            if client.last_used < cutoff:
+                logger.info("Evicting idle Brenger client: %s", client.metrics.labels)
+                del self._clients[api_key]
+
+
+def _mask_key(api_key: str) -> str:
+    return f"...{api_key[-4:]}"
@@ -0,0 +1,120 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from requests import Response
+
+from brenger.cassette import CassettePlayer, CassetteRecorder
+from brenger.client import BrengerV2APIClient
+from brenger.exceptions import APIServerError
+
+STATUS_RESPONSE_JSON = {
+    "shipment_id": "shipment-id",
+    "external_reference": "order-1",
+    "status": "delivered",
+    "events": [
+        {"id": "event-1", "timestamp": "2024-01-01T10:00:00Z", "status": "delivered"}
+    ],
+}
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cassette.jsonl.gz")
+        self.client = BrengerV2APIClient(api_key="test-api-key")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _recorded_response(self, request, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(STATUS_RESPONSE_JSON).encode()
+        response.request = request
+        response.url = request.url
+        return response
+
+    def _slow_response(self, request, **kwargs):
+        time.sleep(0.1)
+        return self._recorded_response(request, **kwargs)
+
+    def _record(self, side_effect, **kwargs):
+        recorder = CassetteRecorder(self.path, **kwargs)
+        self.client.session.mount("https://", recorder)
+        with patch("brenger.cassette.HTTPAdapter.send", side_effect=side_effect):
+            self.client.get_shipment_status("shipment-id")
+        return recorder
+
+    def _read_cassette(self):
+        return [
+            json.loads(line)
+            for line in gzip.open(self.path, "rt", encoding="utf-8")
+            if line.strip()
+        ]
+
+    def test_record_then_replay(self):
+        recorder = CassetteRecorder(self.path)
+        self.client.session.mount("https://", recorder)
+        with patch(
+            "brenger.cassette.HTTPAdapter.send", side_effect=self._recorded_response
+        ):
+            recorded = self.client.get_shipment_status("shipment-id")
+        recorder.close()
+
+        replay_client = BrengerV2APIClient(api_key="test-api-key")
+        replay_client.session.mount("https://", CassettePlayer(self.path))
+        replayed = replay_client.get_shipment_status("shipment-id")
+        self.assertEqual(replayed, recorded)
+
+    def test_unrecorded_request_raises(self):
+        CassetteRecorder(self.path).close()
+        self.client.session.mount("https://", CassettePlayer(self.path))
+        with self.assertRaises(APIServerError):
+            self.client.get_shipment_status("unknown-id")
+
+    def test_recorded_latency_is_replayed(self):
+        self._record(self._slow_response).close()
+        [interaction] = self._read_cassette()
+        self.assertGreaterEqual(interaction["response"]["elapsed"], 0.1)
+
+        replay_client = BrengerV2APIClient(api_key="test-api-key")
+        replay_client.session.mount(
+            "https://", CassettePlayer(self.path, replay_latency=True)
+        )
+        start = time.perf_counter()
+        replay_client.get_shipment_status("shipment-id")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+
+    def test_recording_overwrites_unless_appending(self):
+        self._record(self._recorded_response).close()
+        self._record(self._recorded_response).close()
+        self.assertEqual(len(self._read_cassette()), 1)
+
+        with self._record(self._recorded_response, append=True):
+            pass
+        self.assertEqual(len(self._read_cassette()), 2)
+
+    def test_unclosed_gzip_cassette_is_replayed(self):
+        self._record(self._recorded_response)
+
+        replay_client = BrengerV2APIClient(api_key="test-api-key")
+        replay_client.session.mount("https://", CassettePlayer(self.path))
+        response = replay_client.get_shipment_status("shipment-id")
+        self.assertEqual(response.shipment_id, "shipment-id")
+
+    def test_replayed_response_can_be_streamed(self):
+        self._record(self._recorded_response).close()
+        session = BrengerV2APIClient(api_key="test-api-key").session
+        session.mount("https://", CassettePlayer(self.path))
+
+        response = session.get(
+            f"{self.client.base_url}/shipments/shipment-id/status", stream=True
+        )
+        body = b"".join(response.iter_content(2))
+        self.assertEqual(json.loads(body), STATUS_RESPONSE_JSON)
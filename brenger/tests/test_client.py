@@ -41,3 +41,4 @@ class TestBrengerAPIClient(unittest.TestCase):
             self.client.create_shipment(self.test_shipment_data)
 
         self.assertIn("Client Error:  Status code: 400", str(context.exception))
+        self.assertEqual(context.exception.status_code, 400)
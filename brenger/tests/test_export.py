@@ -0,0 +1,120 @@
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from brenger.exceptions import APIClientError, APIServerError
+from brenger.export import export_shipments, iter_shipment_rows
+from brenger.models import V2RefundResponse
+from brenger.tests import dummy_data
+
+refund_response = V2RefundResponse(
+    refund_id="refund-id",
+    code="damaged",
+    amount={
+        "vat": {"currency": "EUR", "value": "3.83"},
+        "incl_vat": {"currency": "EUR", "value": "22.10"},
+        "excl_vat": {"currency": "EUR", "value": "18.27"},
+    },
+)
+
+
+class TestExportShipments(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.get_shipment.side_effect = lambda shipment_id: (
+            dummy_data.shipment_response.model_copy(update={"id": shipment_id})
+        )
+        self.v2_client = MagicMock()
+        self.v2_client.get_refund.return_value = refund_response
+
+    def test_rows_are_flattened_in_input_order(self):
+        shipment_ids = [f"shipment-{index}" for index in range(50)]
+        rows = list(
+            iter_shipment_rows(
+                shipment_ids, self.client, self.v2_client, max_workers=4
+            )
+        )
+        self.assertEqual([row["shipment_id"] for row in rows], shipment_ids)
+        self.assertEqual(rows[0]["price_incl_vat_cents"], 2210)
+        self.assertEqual(rows[0]["refund_incl_vat_cents"], 2210)
+        self.assertEqual(rows[0]["refund_vat_cents"], 383)
+        self.assertEqual(rows[0]["refund_currency"], "EUR")
+
+    def test_missing_refund_leaves_refund_columns_empty(self):
+        self.v2_client.get_refund.side_effect = APIClientError(
+            "not found", status_code=404
+        )
+        [row] = iter_shipment_rows(["shipment-1"], self.client, self.v2_client)
+        self.assertIsNone(row["refund_id"])
+        self.assertIsNone(row["refund_incl_vat_cents"])
+
+    def test_other_refund_errors_are_raised(self):
+        self.v2_client.get_refund.side_effect = APIClientError(
+            "too many requests", status_code=429
+        )
+        with self.assertRaises(APIClientError):
+            list(iter_shipment_rows(["shipment-1"], self.client, self.v2_client))
+
+    def test_failed_shipment_stops_export_by_default(self):
+        self.client.get_shipment.side_effect = APIServerError("unavailable")
+        rows = iter_shipment_rows(["shipment-1", "shipment-2"], self.client)
+        with self.assertRaises(APIServerError):
+            list(rows)
+
+    def test_on_error_skips_failed_shipments(self):
+        def get_shipment(shipment_id):
+            if shipment_id == "shipment-2":
+                raise APIServerError("unavailable")
+            return dummy_data.shipment_response.model_copy(update={"id": shipment_id})
+
+        self.client.get_shipment.side_effect = get_shipment
+        on_error = MagicMock()
+        rows = list(
+            iter_shipment_rows(
+                ["shipment-1", "shipment-2", "shipment-3"],
+                self.client,
+                on_error=on_error,
+            )
+        )
+        self.assertEqual(
+            [row["shipment_id"] for row in rows], ["shipment-1", "shipment-3"]
+        )
+        [(shipment_id, exc), _] = on_error.call_args
+        self.assertEqual(shipment_id, "shipment-2")
+        self.assertIsInstance(exc, APIServerError)
+
+    def test_export_to_ndjson(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "shipments.ndjson")
+            count = export_shipments(
+                (f"shipment-{index}" for index in range(10)), path, self.client
+            )
+            with open(path, encoding="utf-8") as export_file:
+                rows = [json.loads(line) for line in export_file]
+        self.assertEqual(count, 10)
+        self.assertEqual(rows[9]["shipment_id"], "shipment-9")
+        self.assertIsNone(rows[9]["refund_id"])
+        self.v2_client.get_refund.assert_not_called()
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_export_to_parquet(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "shipments.parquet")
+            export_shipments(
+                (f"shipment-{index}" for index in range(5)),
+                path,
+                self.client,
+                self.v2_client,
+                batch_size=2,
+            )
+            parquet_file = pq.ParquetFile(path)
+            rows = parquet_file.read().to_pylist()
+        self.assertEqual(parquet_file.num_row_groups, 3)
+        self.assertEqual(rows[0]["price_incl_vat_cents"], 2210)
+        self.assertEqual(rows[0]["refund_incl_vat_cents"], 2210)
+        self.assertEqual(rows[0]["refund_code"], "damaged")
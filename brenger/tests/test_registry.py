@@ -0,0 +1,151 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from brenger.registry import BrengerClientRegistry
+from brenger.tests import dummy_data
+
+
+class TestBrengerClientRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = BrengerClientRegistry(max_concurrency=2, idle_timeout=60)
+
+    def test_clients_are_cached_per_api_key(self):
+        first = self.registry.get_client("key-one", tenant="partner-one")
+        self.assertIs(first, self.registry.get_client("key-one"))
+        second = self.registry.get_client("key-two")
+        self.assertIsNot(first, second)
+        self.assertEqual(second.session.headers["X-AUTH-TOKEN"], "key-two")
+
+    def test_clients_share_connection_pool(self):
+        first = self.registry.get_client("key-one")
+        second = self.registry.get_client("key-two")
+        self.assertIs(first.session.get_adapter("https://"), self.registry.adapter)
+        self.assertIs(second.session.get_adapter("https://"), self.registry.adapter)
+
+    @patch("brenger.client.requests.Session.request")
+    def test_metrics_are_recorded_per_tenant(self, mock_request):
+        mock_response = mock_request.return_value
+        mock_response.status_code = 200
+        mock_response.json.return_value = dummy_data.shipment_response_json
+        client = self.registry.get_client("key-one", tenant="partner-one")
+
+        client.cancel_shipment("shipment-id")
+
+        [metrics] = self.registry.metrics()
+        self.assertEqual(metrics["labels"], {"tenant": "partner-one"})
+        self.assertEqual(metrics["requests"], 1)
+        self.assertEqual(metrics["errors"], 0)
+
+    def test_idle_clients_are_evicted(self):
+        client = self.registry.get_client("key-one")
+        client.last_used -= 120
+        self.registry.get_client("key-two")
+        self.assertEqual(len(self.registry), 1)
+        self.assertIsNot(client, self.registry.get_client("key-one"))
+
+    @patch("brenger.client.requests.Session.request")
+    def test_metrics_survive_eviction(self, mock_request):
+        mock_request.return_value.status_code = 200
+        client = self.registry.get_client("key-one", tenant="partner-one")
+        client.cancel_shipment("shipment-id")
+        client.last_used -= 120
+        self.registry.get_client("key-two")
+
+        replacement = self.registry.get_client("key-one")
+        self.assertIsNot(client, replacement)
+        self.assertIs(client.budget, replacement.budget)
+        metrics = {m["labels"]["tenant"]: m for m in self.registry.metrics()}
+        self.assertEqual(metrics["partner-one"]["requests"], 1)
+
+    @patch("brenger.client.requests.Session.request")
+    def test_rate_limit_spaces_calls(self, mock_request):
+        call_times = []
+
+        def request(*args, **kwargs):
+            call_times.append(time.monotonic())
+            return mock_request.return_value
+
+        mock_request.side_effect = request
+        mock_request.return_value.status_code = 200
+        client = self.registry.get_client("key-one", rate_limit=20)
+
+        start = time.monotonic()
+        for _ in range(5):
+            client.cancel_shipment("shipment-id")
+
+        # The n-th call may not start before n intervals of 1/20s have passed.
+        for index, call_time in enumerate(call_times):
+            self.assertGreaterEqual(call_time - start, index * 0.05 - 0.001)
+
+    @patch("brenger.client.requests.Session.request")
+    def test_concurrency_never_exceeds_budget(self, mock_request):
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def request(*args, **kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return mock_request.return_value
+
+        mock_request.side_effect = request
+        mock_request.return_value.status_code = 200
+        client = self.registry.get_client("key-one")
+
+        threads = [
+            threading.Thread(target=client.cancel_shipment, args=("shipment-id",))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(client.metrics.requests, 8)
+
+    @patch("brenger.client.requests.Session.request")
+    def test_rate_limit_holds_while_calls_queue_on_concurrency(self, mock_request):
+        call_times = []
+
+        def request(*args, **kwargs):
+            call_times.append(time.monotonic())
+            # The first call holds the only concurrency slot while others queue.
+            time.sleep(0.2 if len(call_times) == 1 else 0.01)
+            return mock_request.return_value
+
+        mock_request.side_effect = request
+        mock_request.return_value.status_code = 200
+        client = self.registry.get_client("key-one", rate_limit=10, max_concurrency=1)
+
+        threads = [
+            threading.Thread(target=client.cancel_shipment, args=("shipment-id",))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        call_times.sort()
+        gaps = [b - a for a, b in zip(call_times, call_times[1:])]
+        self.assertEqual(len(gaps), 3)
+        for gap in gaps:
+            self.assertGreaterEqual(gap, 0.09)
+
+    def test_forget_drops_budget_and_metrics(self):
+        client = self.registry.get_client("key-one", tenant="partner-one")
+        self.registry.evict("key-two", forget=True)
+        self.registry.evict("key-one")
+        self.assertEqual(len(self.registry.metrics()), 1)
+
+        self.registry.evict("key-one", forget=True)
+        self.assertEqual(self.registry.metrics(), [])
+        self.assertIsNot(client.budget, self.registry.get_client("key-one").budget)